@@ -4,7 +4,7 @@ from __future__ import annotations
 Streamlit frontend for VibeWriter.
 
 This app integrates with existing backend modules:
-- generator.generate_posts
+- generator.iter_posts
 - llm_adapters.build_adapter
 - image_fetcher.UnsplashFetcher, image_fetcher.SuggestionFetcher
 - utils.to_json
@@ -18,10 +18,9 @@ Features:
 - Visual cards for each generated post
 """
 
-import json
+import hashlib
 import os
-from dataclasses import asdict
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 import streamlit as st
 from dotenv import load_dotenv
@@ -33,11 +32,13 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.generator import generate_posts
-from src.llm_adapters import build_adapter
-from src.image_fetcher import UnsplashFetcher, SuggestionFetcher
 from src.utils import to_json
 from src.streamlit_ui.cards import render_post_cards
+from src.streamlit_ui.payload_cache import PayloadCache
+
+if TYPE_CHECKING:
+    # Backend modules are imported on first Generate so the initial render stays light
+    from src.llm_adapters import LLMAdapter
 
 
 def get_env_value(key: str, fallback: str | None = None) -> Optional[str]:
@@ -143,6 +144,39 @@ def validate_inputs(params: Dict[str, Optional[str]]) -> Optional[str]:
     return None
 
 
+def key_digest(*keys: Optional[str]) -> str:
+    """Return a SHA256 digest of the API keys so they can key caches without being stored."""
+    return hashlib.sha256("\0".join(k or "" for k in keys).encode("utf-8")).hexdigest()
+
+
+@st.cache_resource(show_spinner=False)
+def shared_http_client() -> Optional[Any]:
+    """One pooled HTTP client per process, shared by every cached OpenAI adapter."""
+    from src.llm_adapters import build_http_client
+
+    return build_http_client()
+
+
+@st.cache_resource(show_spinner=False)
+def cached_adapter(provider: str, model: str, keys_digest: str, _keys: Dict[str, Optional[str]]) -> LLMAdapter:
+    """Build the LLM adapter once per (provider, model, keys) so its client survives reruns."""
+    from src.llm_adapters import build_adapter
+
+    http_client = shared_http_client() if provider.lower() == "openai" else None
+    return build_adapter(provider=provider, model=model, keys=_keys, http_client=http_client)
+
+
+@st.cache_resource(show_spinner=False)
+def payload_cache() -> PayloadCache:
+    """Process-wide memo of finished payloads, keyed on the inputs and API key digest.
+
+    Generation must stay out of `st.cache_data`: cards are streamed into
+    placeholders created outside the cached function, and Streamlit cannot
+    replay those element calls on a cache hit (CacheReplayClosureError).
+    """
+    return PayloadCache(ttl=3600)
+
+
 def main() -> None:
     load_dotenv(override=False)
     page_config()
@@ -168,46 +202,81 @@ def main() -> None:
         }
 
         try:
-            adapter = build_adapter(provider=provider, model=model, keys=keys)
+            adapter = cached_adapter(
+                provider=provider,
+                model=model,
+                keys_digest=key_digest(keys["google"], keys["openai"], keys["anthropic"]),
+                _keys=keys,
+            )
         except Exception as exc:  # defensive: adapter building should be safe
             st.error(f"Failed to build LLM adapter: {exc}")
             return
 
         # Build Image fetcher
+        from src.image_fetcher import SuggestionFetcher, UnsplashFetcher
+
         image_source = params.get("image_source") or "unsplash"
+        unsplash_key = params.get("unsplash_key") or os.getenv("UNSPLASH_ACCESS_KEY") or ""
         if image_source == "unsplash":
-            fetcher = UnsplashFetcher(params.get("unsplash_key") or os.getenv("UNSPLASH_ACCESS_KEY") or "")
+            fetcher = UnsplashFetcher(unsplash_key)
         else:
             fetcher = SuggestionFetcher()
 
-        # Generate posts with progress feedback
-        with st.spinner("Generating posts..."):
-            try:
-                result = generate_posts(
-                    topic=str(params.get("topic")),
-                    variants=int(params.get("variants") or 3),
-                    llm=adapter,
-                    image_fetcher=fetcher,
-                    open_links=True,
-                )
-            except Exception as exc:
-                st.error(f"Generation failed: {exc}")
-                return
-
-        payload = {"topic": result.topic, "variants": result.variants}
-
-        # JSON expander and download
-        with st.expander("Raw JSON output", expanded=False):
-            st.code(to_json(payload, pretty=True), language="json")
+        topic = str(params.get("topic"))
+        variants = int(params.get("variants") or 3)
+        cache_key = (
+            topic,
+            variants,
+            provider,
+            model,
+            image_source,
+            key_digest(keys["google"], keys["openai"], unsplash_key),
+        )
+
+        # Reserve slots so the JSON expander stays above the cards once generation finishes
+        json_slot = st.container()
+        cards_slot = st.empty()
+
+        # Identical inputs are served from the payload cache; otherwise stream each card
+        # as soon as its variant is ready
+        cache = payload_cache()
+        payload = cache.get(cache_key)
+        if payload is None:
+            from src.generator import iter_posts
+
+            variants_out: List[Dict[str, Optional[str]]] = []
+            with st.spinner("Generating posts..."):
+                try:
+                    for variant in iter_posts(
+                        topic=topic,
+                        variants=variants,
+                        llm=adapter,
+                        image_fetcher=fetcher,
+                        open_links=True,
+                    ):
+                        variants_out.append(variant)
+                        with cards_slot.container():
+                            render_post_cards({"variants": variants_out})
+                except Exception as exc:
+                    st.error(f"Generation failed: {exc}")
+                    return
+            payload = {"topic": topic, "variants": variants_out}
+            cache.put(cache_key, payload)
+
+        # JSON expander and download share a single serialization
+        json_text = to_json(payload, pretty=True)
+        with json_slot.expander("Raw JSON output", expanded=False):
+            st.code(json_text, language="json")
             st.download_button(
                 label="Download JSON",
                 file_name="posts.json",
                 mime="application/json",
-                data=json.dumps(payload, ensure_ascii=False, indent=2),
+                data=json_text,
             )
 
         # Visual cards
-        render_post_cards(payload)
+        with cards_slot.container():
+            render_post_cards(payload)
 
     else:
         st.info("Enter a topic and click Generate Posts to get started.")
@@ -5,7 +5,7 @@ import sys
 from typing import Optional
 
 from .config import load_config
-from .llm_adapters import build_adapter
+from .llm_adapters import build_adapter, build_http_client
 from .image_fetcher import UnsplashFetcher, SuggestionFetcher
 from .generator import generate_posts
 from .utils import to_json
@@ -30,6 +30,8 @@ def main(argv: Optional[list[str]] = None) -> int:
     provider = (args.llm_provider or cfg.llm_provider).strip()
     model = (args.model or cfg.llm_model).strip()
 
+    # All concurrent variant requests share one connection pool
+    http_client = build_http_client() if provider.lower() == "openai" else None
     adapter = build_adapter(
         provider=provider,
         model=model,
@@ -38,6 +40,7 @@ def main(argv: Optional[list[str]] = None) -> int:
             "openai": cfg.openai_api_key,
             "anthropic": None,
         },
+        http_client=http_client,
     )
 
     if args.image_bank == "unsplash":
@@ -45,16 +48,21 @@ def main(argv: Optional[list[str]] = None) -> int:
     else:
         fetcher = SuggestionFetcher()
 
-    result = generate_posts(
-        topic=args.topic,
-        variants=args.variants,
-        llm=adapter,
-        image_fetcher=fetcher,
-        open_links=args.open_links,
-    )
-
-    payload = {"topic": result.topic, "variants": result.variants}
-    text = to_json(payload, pretty=True)
+    try:
+        result = generate_posts(
+            topic=args.topic,
+            variants=args.variants,
+            llm=adapter,
+            image_fetcher=fetcher,
+            open_links=args.open_links,
+        )
+    finally:
+        # Closing also aborts any surplus speculative calls still in flight; their results
+        # are discarded anyway, and this lets their worker threads exit promptly
+        if http_client is not None:
+            http_client.close()
+
+    text = to_json(result, pretty=True)
 
     if args.output:
         with open(args.output, "w", encoding="utf-8") as f:
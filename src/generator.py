@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set
+from functools import lru_cache
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple
+import json
 import re
 
 from .llm_adapters import LLMAdapter
@@ -14,6 +18,33 @@ POST_TEMPLATE = (
     "Keep it under 220 characters, add 2-3 relevant hashtags, and a positive CTA."
 )
 
+STYLE_CUES = [
+    "upbeat and witty tone",
+    "informative and value-focused tone",
+    "playful with emoji",
+    "urgent, limited-time offer tone",
+    "community-focused, inclusive tone",
+    "minimalist, sleek tone",
+    "friendly conversational tone",
+    "trend-savvy, Gen Z tone",
+    "professional, concise tone",
+    "storytelling hook in first sentence",
+]
+
+BATCH_TEMPLATE = (
+    "You are a creative social media copywriter. Write {n} short, distinct posts about: '{topic}'. "
+    "Give each post its own style, in order: {styles}. "
+    "Keep each under 220 characters, include 2-3 relevant hashtags, and a positive CTA. "
+    'Respond with JSON only, shaped as {{"variants": [{{"text": "..."}}]}}.'
+)
+
+# Most recent caption hashes remembered for uniqueness checks
+SEEN_WINDOW = 256
+
+_CODE_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_NORM_PREFIX_RE = re.compile(r"^\[[^\]]+\]\s*")
+_WS_RE = re.compile(r"\s+")
+
 
 @dataclass
 class GeneratorResult:
@@ -25,107 +56,207 @@ def build_prompt(topic: str) -> str:
     return POST_TEMPLATE.format(topic=topic.strip())
 
 
-def generate_posts(
+def diversify_prompt(topic: str, idx: int, attempt: int) -> str:
+    cue = STYLE_CUES[idx % len(STYLE_CUES)]
+    # Add light diversification across attempts as well
+    alt = [
+        "vary hashtags and CTA",
+        "avoid repeating earlier wording",
+        "use a different angle or benefit",
+        "use different emoji (max 2)",
+    ][attempt % 4]
+    base = (
+        "You are a creative social media copywriter. "
+        f"Write a short, unique post about: '{topic.strip()}'. "
+        f"Use {cue}; {alt}. Keep it under 220 characters, include 2-3 relevant hashtags, and a positive CTA."
+    )
+    return base
+
+
+def build_batch_prompt(topic: str, n: int) -> str:
+    styles = "; ".join(f"{i+1}) {STYLE_CUES[i % len(STYLE_CUES)]}" for i in range(n))
+    return BATCH_TEMPLATE.format(n=n, topic=topic.strip(), styles=styles)
+
+
+def parse_batched_variants(raw: str) -> List[str]:
+    """Extract caption texts from a batched JSON reply; returns [] if it cannot be parsed."""
+    try:
+        data = json.loads(_CODE_FENCE_RE.sub("", raw))
+    except ValueError:
+        return []
+    items = data.get("variants") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return []
+    texts: List[str] = []
+    for item in items:
+        value = item.get("text") if isinstance(item, dict) else item
+        if isinstance(value, str) and value.strip():
+            texts.append(value)
+    return texts
+
+
+def generate_variants_batched(topic: str, n: int, llm: LLMAdapter) -> List[str]:
+    """Request n captions in a single structured call instead of n separate ones.
+
+    The result may be shorter than n (or empty) when the model or adapter does not
+    return usable JSON; callers fill the remaining slots individually.
+    """
+    raw = llm.generate_text(build_batch_prompt(topic, n), max_tokens=140 * n, json_mode=True)
+    return parse_batched_variants(raw)
+
+
+def speculative_count(needed: int, can_collide: bool) -> int:
+    """Number of prompts to fire for `needed` captions in one speculative round.
+
+    Over-sampling covers duplicates without another serial round-trip, but a lone
+    caption with nothing to collide with is always accepted, so extras would be wasted.
+    """
+    if needed == 1 and not can_collide:
+        return 1
+    return max(needed + 2, int(needed * 1.5))
+
+
+@lru_cache(maxsize=256)
+def normalize_for_uniqueness(text: str) -> str:
+    # Remove common stub prefixes like "[Gemini STUB]" for fair deduping
+    cleaned = _NORM_PREFIX_RE.sub("", text).strip().lower()
+    # Collapse whitespace
+    cleaned = _WS_RE.sub(" ", cleaned)
+    return cleaned
+
+
+def iter_posts(
     topic: str,
     variants: int,
     llm: LLMAdapter,
     image_fetcher: ImageFetcher,
     open_links: bool = False,
-) -> GeneratorResult:
-    results: List[Dict[str, Optional[str]]] = []
-    seen_texts: Set[str] = set()
-
-    def normalize_for_uniqueness(text: str) -> str:
-        # Remove common stub prefixes like "[Gemini STUB]" for fair deduping
-        cleaned = re.sub(r"^\[[^\]]+\]\s*", "", text).strip().lower()
-        # Collapse whitespace
-        cleaned = re.sub(r"\s+", " ", cleaned)
-        return cleaned
-
-    style_cues = [
-        "upbeat and witty tone",
-        "informative and value-focused tone",
-        "playful with emoji",
-        "urgent, limited-time offer tone",
-        "community-focused, inclusive tone",
-        "minimalist, sleek tone",
-        "friendly conversational tone",
-        "trend-savvy, Gen Z tone",
-        "professional, concise tone",
-        "storytelling hook in first sentence",
-    ]
-
-    def diversify_prompt(topic: str, idx: int, attempt: int) -> str:
-        cue = style_cues[idx % len(style_cues)]
-        # Add light diversification across attempts as well
-        alt = [
-            "vary hashtags and CTA",
-            "avoid repeating earlier wording",
-            "use a different angle or benefit",
-            "use different emoji (max 2)",
-        ][attempt % 4]
-        base = (
-            "You are a creative social media copywriter. "
-            f"Write a short, unique post about: '{topic.strip()}'. "
-            f"Use {cue}; {alt}. Keep it under 220 characters, include 2-3 relevant hashtags, and a positive CTA."
-        )
-        return base
-
-    # Derive an image query from topic (simple heuristic) and fetch a pool of images once
+) -> Iterator[Dict[str, Optional[str]]]:
+    """Yield each post variant as soon as its caption is accepted.
+
+    Multiple variants are first requested in one batched call; any slots it
+    leaves unfilled are over-sampled with concurrent per-variant prompts and
+    the first unique captions win. Variants are yielded in completion order,
+    not prompt order; the n-th yielded variant receives the n-th image.
+    """
+    count = max(1, variants)
+    # Hashes of normalized captions; each candidate is normalized and hashed exactly once.
+    # The deque bounds the window so memory stays flat however many candidates are sampled.
+    seen_hashes: Set[int] = set()
+    seen_queue: Deque[int] = deque(maxlen=SEEN_WINDOW)
+    produced = 0
+
+    def remember(text_hash: int) -> None:
+        if len(seen_queue) == seen_queue.maxlen:
+            seen_hashes.discard(seen_queue[0])
+        seen_queue.append(text_hash)
+        seen_hashes.add(text_hash)
+
+    # Derive an image query from topic (simple heuristic)
     image_query = topic
-    requested_images = max(1, variants)
-    image_pool: List[ImageResult] = image_fetcher.search(image_query, limit=requested_images, open_links=open_links)
-
-    total_images = len(image_pool)
-
-    for idx in range(max(1, variants)):
-        # Try up to a few times to obtain a unique variant
-        text: str = ""
-        for attempt in range(4):
-            prompt = diversify_prompt(topic, idx, attempt)
-            raw = llm.generate_text(prompt, max_tokens=140)
-            candidate = safe_clean_output(raw, max_chars=220)
-            norm = normalize_for_uniqueness(candidate)
-            if norm and norm not in seen_texts:
-                text = candidate
-                seen_texts.add(norm)
-                break
-        if not text:
-            # Last-resort diversification: append a subtle variant tag to ensure difference
-            fallback = safe_clean_output(llm.generate_text(build_prompt(topic), max_tokens=120), max_chars=210)
-            text = f"{fallback} #{idx+1}"
-            # don't add to seen_texts yet; we'll run a final uniqueness guard below
+    image_pool: Optional[List[ImageResult]] = None
 
+    def assemble(text: str) -> Dict[str, Optional[str]]:
+        nonlocal image_pool
+        if image_pool is None:
+            image_pool = image_future.result()
         # Assign a distinct image per variant when available; otherwise, fall back or cycle
-        if total_images > 0:
-            image_choice = image_pool[idx % total_images]
-            image_url = image_choice.url
-            image_query_out = image_choice.query
-        else:
-            image_url = None
-            image_query_out = image_query
+        if image_pool:
+            image_choice = image_pool[produced % len(image_pool)]
+            return {"text": text, "image_query": image_choice.query, "image_url": image_choice.url}
+        return {"text": text, "image_query": image_query, "image_url": None}
+
+    def last_resort(position: int) -> Tuple[str, int]:
+        # Last-resort diversification: append a subtle variant tag to ensure difference
+        fallback = safe_clean_output(llm.generate_text(build_prompt(topic), max_tokens=120), max_chars=210)
+        text = f"{fallback} #{position+1}"
+        text_hash = hash(normalize_for_uniqueness(text))
 
         # Final guard: ensure uniqueness even if the model returned identical text across attempts
         # This avoids duplicate captions when using stub providers.
-        norm_text = normalize_for_uniqueness(text)
-        if norm_text in seen_texts:
-            # Append a short variant tag tied to index until unique
+        if text_hash in seen_hashes:
+            # Append a short variant tag tied to position until unique
             # Use a bounded number of attempts to prevent infinite loops
             for k in range(1, 5):
-                candidate_text = f"{text} · v{idx+1}" if k == 1 else f"{text} · v{idx+1}.{k}"
-                norm_candidate = normalize_for_uniqueness(candidate_text)
-                if norm_candidate not in seen_texts:
-                    text = candidate_text
-                    norm_text = norm_candidate
+                candidate_text = f"{text} · v{position+1}" if k == 1 else f"{text} · v{position+1}.{k}"
+                candidate_hash = hash(normalize_for_uniqueness(candidate_text))
+                if candidate_hash not in seen_hashes:
+                    return candidate_text, candidate_hash
+        return text, text_hash
+
+    def accept(raw: str) -> Optional[str]:
+        # Clean, then record the caption if its normalized form has not been seen yet
+        candidate = safe_clean_output(raw, max_chars=220)
+        norm = normalize_for_uniqueness(candidate)
+        candidate_hash = hash(norm)
+        if not norm or candidate_hash in seen_hashes:
+            return None
+        remember(candidate_hash)
+        return candidate
+
+    executor = ThreadPoolExecutor(max_workers=speculative_count(count, can_collide=count > 1) + 1)
+    try:
+        # Fetch the image pool in the background so it overlaps with LLM generation
+        image_future = executor.submit(image_fetcher.search, image_query, limit=count, open_links=open_links)
+
+        # One structured request for all variants amortizes per-request overhead
+        if count > 1:
+            for raw in generate_variants_batched(topic, count, llm):
+                if produced >= count:
+                    break
+                text = accept(raw)
+                if text is not None:
+                    yield assemble(text)
+                    produced += 1
+
+        # Speculative rounds: fire every prompt at once and keep the first unique captions.
+        # Each slot maps to a distinct style cue / diversification pair across rounds.
+        next_slot = produced
+        rejected = False
+        for _ in range(2):
+            needed = count - produced
+            if needed <= 0:
+                break
+            n_speculative = speculative_count(needed, can_collide=bool(seen_hashes) or rejected)
+            pending: List[Future[str]] = [
+                executor.submit(
+                    llm.generate_text,
+                    diversify_prompt(topic, slot, slot // len(STYLE_CUES)),
+                    max_tokens=140,
+                )
+                for slot in range(next_slot, next_slot + n_speculative)
+            ]
+            next_slot += n_speculative
+            for future in as_completed(pending):
+                text = accept(future.result())
+                if text is None:
+                    rejected = True
+                    continue
+                yield assemble(text)
+                produced += 1
+                if produced >= count:
                     break
-        seen_texts.add(norm_text)
+            for future in pending:
+                future.cancel()
+
+        while produced < count:
+            text, text_hash = last_resort(produced)
+            remember(text_hash)
+            yield assemble(text)
+            produced += 1
+    finally:
+        # Surplus speculative calls still in flight are left to finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
 
-        results.append({
-            "text": text,
-            "image_query": image_query_out,
-            "image_url": image_url,
-        })
 
+def generate_posts(
+    topic: str,
+    variants: int,
+    llm: LLMAdapter,
+    image_fetcher: ImageFetcher,
+    open_links: bool = False,
+) -> GeneratorResult:
+    results = list(iter_posts(topic, variants, llm, image_fetcher, open_links=open_links))
     return GeneratorResult(topic=topic, variants=results)
 
 
@@ -1,11 +1,49 @@
 from __future__ import annotations
 
-import random
+import hashlib
+import json
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from urllib.parse import quote_plus
 
-import requests
+from . import llm_cache
+
+
+UNSPLASH_MAX_PER_PAGE = 30
+UNSPLASH_TIMEOUT = (3, 10)
+
+# Shared session so repeated searches reuse pooled keep-alive connections
+# instead of paying a fresh TCP+TLS handshake on every call. Built on first
+# use so that suggestion-only runs never import `requests`.
+_SESSION: Optional[Any] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> Any:
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                session.mount(
+                    "https://",
+                    HTTPAdapter(
+                        pool_connections=8,
+                        pool_maxsize=8,
+                        # Retry only failed connects: a retried read timeout would multiply the
+                        # stall, and the first streamed card waits on this search
+                        max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.2),
+                    ),
+                )
+                _SESSION = session
+    return _SESSION
 
 
 @dataclass
@@ -28,24 +66,45 @@ class UnsplashFetcher(ImageFetcher):
             # behave like suggest mode when key missing
             return SuggestionFetcher().search(query, limit=limit, open_links=open_links)
 
+        cache_key = llm_cache.make_key(provider="unsplash", query=query, limit=limit, open_links=open_links)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return [ImageResult(query=q, url=u) for q, u in json.loads(cached)]
+
         url = "https://api.unsplash.com/search/photos"
-        params = {
-            "query": query,
-            "per_page": max(1, min(limit, 5)),
-            "orientation": "landscape",
-        }
+        # Unsplash allows up to 30 results per page, so typical variant counts need one request
+        per_page = max(1, min(limit, UNSPLASH_MAX_PER_PAGE))
+        pages = max(1, math.ceil(limit / per_page))
         headers = {"Accept-Version": "v1", "Authorization": f"Client-ID {self.access_key}"}
-        try:
-            resp = requests.get(url, params=params, headers=headers, timeout=10)
+
+        def fetch_page(page: int) -> List[Dict[str, Any]]:
+            params = {
+                "query": query,
+                "per_page": per_page,
+                "page": page,
+                "orientation": "landscape",
+            }
+            # (connect, read): three short connect attempts plus one read stay within the old 10s + 10s
+            resp = _get_session().get(url, params=params, headers=headers, timeout=UNSPLASH_TIMEOUT)
             resp.raise_for_status()
-            data = resp.json()
+            return resp.json().get("results", [])
+
+        try:
+            if pages == 1:
+                items = fetch_page(1)
+            else:
+                # Request all pages concurrently rather than one round-trip after another
+                with ThreadPoolExecutor(max_workers=pages) as executor:
+                    items = [item for page_items in executor.map(fetch_page, range(1, pages + 1)) for item in page_items]
             results = []
-            for item in data.get("results", [])[:limit]:
+            # Only the last page can overshoot `limit`
+            for item in items[:limit]:
                 # Prefer full URL if open_links; otherwise provide None
                 img_url = item.get("urls", {}).get("regular") if open_links else None
                 results.append(ImageResult(query=query, url=img_url))
             if not results:
                 return SuggestionFetcher().search(query, limit=limit, open_links=open_links)
+            llm_cache.put(cache_key, json.dumps([[r.query, r.url] for r in results]))
             return results
         except Exception:
             return SuggestionFetcher().search(query, limit=limit, open_links=open_links)
@@ -60,20 +119,20 @@ class SuggestionFetcher(ImageFetcher):
         "seasonal promo graphic",
         "close-up espresso"
     ]
+    # The suggestion list is static, so build each Picsum placeholder URL once at class load.
+    # Picsum serves deterministic images per seed and needs no API key.
+    _ENCODED = [(pick, f"https://picsum.photos/seed/{quote_plus(pick)}/800/600") for pick in SUGGESTIONS]
+    # Doubled so any rotation of the list is a single slice
+    _ENCODED_RING = _ENCODED * 2
 
     def search(self, query: str, limit: int = 1, open_links: bool = False) -> List[ImageResult]:
-        random.seed(hash(query) % (2**32))
-        picks = random.sample(self.SUGGESTIONS, k=min(limit, len(self.SUGGESTIONS)))
+        # Rotate to a start index derived from a stable digest of the query: deterministic
+        # across processes, no RNG state, and distinct picks without replacement.
+        n = len(self._ENCODED)
+        start = int.from_bytes(hashlib.blake2b(query.encode("utf-8"), digest_size=8).digest(), "little") % n
+        picks = self._ENCODED_RING[start : start + min(limit, n)]
         # If open_links is requested (e.g., Streamlit UI), return a placeholder image URL
         # that does not require API keys. Otherwise keep URLs as None.
-        if open_links:
-            results: List[ImageResult] = []
-            for pick in picks:
-                # Use Picsum for placeholder images by deterministic seed; no API key required.
-                encoded = quote_plus(pick)
-                placeholder_url = f"https://picsum.photos/seed/{encoded}/800/600"
-                results.append(ImageResult(query=pick, url=placeholder_url))
-            return results
-        return [ImageResult(query=pick, url=None) for pick in picks]
+        return [ImageResult(query=pick, url=url if open_links else None) for pick, url in picks]
 
 
@@ -1,20 +1,24 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 import os
+import threading
 
+from . import llm_cache
 
-# OpenAI SDK is optional at runtime depending on provider selection
-try:  # pragma: no cover - exercised in integration, mocked in tests
-    import openai
-except Exception:  # pragma: no cover
-    openai = None  # type: ignore
+
+# Guards lazy construction of SDK clients shared by concurrent generate_text calls
+_CLIENT_LOCK = threading.Lock()
 
 
 class LLMAdapter(ABC):
-    """Abstract interface for pluggable LLM providers."""
+    """Abstract interface for pluggable LLM providers.
+
+    Adapters may honor `json_mode=True` in kwargs to request a JSON-only reply;
+    callers must still tolerate plain text from adapters that ignore it.
+    """
 
     @abstractmethod
     def generate_text(self, prompt: str, max_tokens: int = 300, **kwargs: Any) -> str:
@@ -40,6 +44,15 @@ class GeminiAdapter(LLMAdapter):
             # Return only an example caption without echoing the prompt
             return "Celebrate savings with our limited-time offer! #Deal #Promo"
 
+        model_name = (self.model or "gemini-1.5-flash").strip()
+        json_mode = bool(kwargs.get("json_mode"))
+        cache_key = llm_cache.make_key(
+            provider="google", model=model_name, prompt=prompt, max_tokens=max_tokens, json_mode=json_mode
+        )
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Try real API; if SDK missing or call fails, surface a clear message
         try:
             import google.generativeai as genai  # type: ignore
@@ -48,11 +61,14 @@ class GeminiAdapter(LLMAdapter):
 
         try:
             genai.configure(api_key=api_key)
-            model_name = (self.model or "gemini-1.5-flash").strip()
             model = genai.GenerativeModel(model_name)
-            response = model.generate_content(prompt, generation_config={"max_output_tokens": max_tokens})
+            generation_config: Dict[str, Any] = {"max_output_tokens": max_tokens}
+            if json_mode:
+                generation_config["response_mime_type"] = "application/json"
+            response = model.generate_content(prompt, generation_config=generation_config)
             text = getattr(response, "text", None)
             if isinstance(text, str) and text.strip():
+                llm_cache.put(cache_key, text.strip())
                 return text.strip()
             # Some SDK versions return candidates in a list
             try:
@@ -62,6 +78,7 @@ class GeminiAdapter(LLMAdapter):
                     for p in parts:
                         t = getattr(p, "text", None)
                         if isinstance(t, str) and t.strip():
+                            llm_cache.put(cache_key, t.strip())
                             return t.strip()
             except Exception:
                 pass
@@ -75,26 +92,52 @@ class GeminiAdapter(LLMAdapter):
 class OpenAIAdapter(LLMAdapter):
     api_key: Optional[str]
     model: str
+    # Optional shared httpx.Client (see build_http_client) so several adapters and the
+    # concurrent variant calls reuse one connection pool
+    http_client: Optional[Any] = field(default=None, repr=False, compare=False)
+    _client: Any = field(default=None, init=False, repr=False, compare=False)
 
     def generate_text(self, prompt: str, max_tokens: int = 300, **kwargs: Any) -> str:  # pragma: no cover - thin wrapper
-        if openai is None:
+        # OpenAI SDK is optional at runtime and only imported when this provider is used
+        try:
+            import openai
+        except Exception:
             return "OpenAI SDK not installed. Please install `openai`."
         if not self.api_key:
             return "OPENAI_API_KEY is missing."
 
-        # Configure API key
-        client = openai.OpenAI(api_key=self.api_key)
+        json_mode = bool(kwargs.get("json_mode"))
+        cache_key = llm_cache.make_key(
+            provider="openai", model=self.model, prompt=prompt, max_tokens=max_tokens, json_mode=json_mode
+        )
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Build the client (and its HTTP connection pool) once and reuse it for every call
+        if self._client is None:
+            with _CLIENT_LOCK:
+                if self._client is None:
+                    if self.http_client is not None:
+                        self._client = openai.OpenAI(api_key=self.api_key, http_client=self.http_client)
+                    else:
+                        self._client = openai.OpenAI(api_key=self.api_key)
 
         # Using Responses API for text generation
         try:
-            response = client.responses.create(
+            extra: Dict[str, Any] = {}
+            if json_mode:
+                extra["text"] = {"format": {"type": "json_object"}}
+            response = self._client.responses.create(
                 model=self.model,
                 input=prompt,
                 max_output_tokens=max_tokens,
+                **extra,
             )
             # Prefer convenience accessor when available
             text = getattr(response, "output_text", None)
             if isinstance(text, str) and text.strip():
+                llm_cache.put(cache_key, text.strip())
                 return text.strip()
             # Fallback if structure changes
             return str(response)
@@ -119,12 +162,38 @@ class AnthropicAdapter(LLMAdapter):
         return "[Anthropic STUB] Replace with real API call."
 
 
-def build_adapter(provider: str, model: str, keys: Dict[str, Optional[str]]) -> LLMAdapter:
+def build_http_client(max_connections: int = 32) -> Optional[Any]:
+    """Return an httpx client for the OpenAI SDK, or None if `openai` is not installed.
+
+    HTTP/2 is enabled when the optional `h2` package is available, letting the
+    concurrent variant requests multiplex over a single connection. The Gemini
+    SDK manages its own transport and does not accept an external client.
+    """
+    try:
+        import openai
+    except Exception:
+        return None
+    import importlib.util
+
+    # Build Limits from the SDK's own default so this works whichever httpx flavour it ships with
+    limits_type = type(openai.DEFAULT_CONNECTION_LIMITS)
+    return openai.DefaultHttpxClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=limits_type(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+
+def build_adapter(
+    provider: str,
+    model: str,
+    keys: Dict[str, Optional[str]],
+    http_client: Optional[Any] = None,
+) -> LLMAdapter:
     provider_lower = (provider or "").lower()
     if provider_lower in {"google", "gemini"}:
         return GeminiAdapter(api_key=keys.get("google"), model=model or "gemini-1")
     if provider_lower in {"openai"}:
-        return OpenAIAdapter(api_key=keys.get("openai"), model=model or "gpt-4o-mini")
+        return OpenAIAdapter(api_key=keys.get("openai"), model=model or "gpt-4o-mini", http_client=http_client)
     if provider_lower in {"anthropic", "claude"}:
         return AnthropicAdapter(api_key=keys.get("anthropic"), model=model or "claude-3-haiku-20240307")
     # Fallback
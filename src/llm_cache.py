@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Optional, Set
+
+
+DEFAULT_TTL_SECONDS = 86400
+
+_initialized: Set[Path] = set()
+
+
+def cache_dir() -> Path:
+    """Return the cache directory (``VIBEWRITER_CACHE_DIR`` or ``~/.cache/vibewriter``)."""
+    return Path(os.getenv("VIBEWRITER_CACHE_DIR") or "~/.cache/vibewriter").expanduser()
+
+
+def make_key(**parts: Any) -> str:
+    """Build a stable SHA256 cache key from keyword parts (e.g. provider, model, prompt)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    if os.getenv("VIBEWRITER_CACHE_DISABLED"):
+        return None
+    try:
+        path = cache_dir() / "responses.sqlite3"
+        if path not in _initialized:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5)
+    except Exception:
+        # The cache is an optimization only; never fail generation because of it
+        return None
+    if path not in _initialized:
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)")
+        except Exception:
+            # e.g. "database is locked" under many concurrent calls; retry on the next call
+            conn.close()
+            return None
+        _initialized.add(path)
+    return conn
+
+
+def get(key: str) -> Optional[str]:
+    """Return the cached value for key, or None when missing, expired or disabled."""
+    conn = _connect()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[1] < time.time():
+            with conn:
+                conn.execute("DELETE FROM responses WHERE key = ? AND expires_at < ?", (key, time.time()))
+            return None
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    return row[0] if row is not None else None
+
+
+def put(key: str, value: str, expire: float = DEFAULT_TTL_SECONDS) -> None:
+    """Store value under key for `expire` seconds, purging expired rows. Silently no-ops on errors."""
+    conn = _connect()
+    if conn is None:
+        return
+    try:
+        with conn:
+            # Expired rows are only hidden by get(); drop them here so the file stays bounded
+            conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + expire),
+            )
+    except sqlite3.Error:
+        pass
+    finally:
+        conn.close()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+
+class PayloadCache:
+    """Thread-safe in-memory TTL cache for finished generation payloads.
+
+    Deliberately free of Streamlit calls: the app holds one instance via
+    `st.cache_resource` and streams cards itself on a miss.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 128) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Dict[str, object]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Dict[str, object]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return payload
+
+    def put(self, key: Hashable, payload: Dict[str, object]) -> None:
+        with self._lock:
+            now = time.monotonic()
+            for stale in [k for k, (expires_at, _) in self._entries.items() if expires_at < now]:
+                del self._entries[stale]
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order, so the first entry is the oldest
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (now + self.ttl, payload)
@@ -2,14 +2,32 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Dict
+from dataclasses import asdict, is_dataclass
+from typing import Any
 
+# orjson is an optional speedup; fall back to the stdlib encoder when missing
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency at runtime
+    orjson = None  # type: ignore
 
-PROFANITY_WORDS = {
+
+PROFANITY_WORDS = frozenset({
     "damn",
     "shit",
     "fuck",
-}
+})
+_PROFANITY_WORDS_LC = frozenset(w.casefold() for w in PROFANITY_WORDS)
+
+# One alternation so the text is scanned once regardless of the word count
+_PROFANITY_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(w) for w in sorted(PROFANITY_WORDS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+_STUB_PREFIX_RE = re.compile(r"^\[[^\]]+\]\s*")
+_EXAMPLE_CAPTION_RE = re.compile(r"\s*->\s*Example caption:\s*", re.IGNORECASE)
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE_RE = re.compile(r"\b\+?[0-9][0-9\-\s]{6,}[0-9]\b")
 
 
 def minimal_profanity_filter(text: str) -> str:
@@ -18,6 +36,11 @@ def minimal_profanity_filter(text: str) -> str:
     This is intentionally minimal and only for a prototype. For production,
     use a vetted content moderation system.
     """
+    # Quick reject: almost all captions contain none of the words, so skip the regex
+    lowered = text.casefold()
+    if not any(w in lowered for w in _PROFANITY_WORDS_LC):
+        return text
+
     def mask(word: str) -> str:
         if len(word) <= 2:
             return "*" * len(word)
@@ -27,10 +50,7 @@ def minimal_profanity_filter(text: str) -> str:
         original = match.group(0)
         return mask(original)
 
-    for w in PROFANITY_WORDS:
-        pattern = re.compile(rf"\b{re.escape(w)}\b", flags=re.IGNORECASE)
-        text = pattern.sub(repl, text)
-    return text
+    return _PROFANITY_RE.sub(repl, text)
 
 
 def truncate_text(text: str, max_chars: int) -> str:
@@ -47,22 +67,36 @@ def scrub_pii(text: str) -> str:
     This is minimal and heuristic-based. For GDPR compliance, ensure data
     minimization, explicit consent, and comprehensive policies.
     """
-    text = re.sub(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", "[email]", text)
-    text = re.sub(r"\b\+?[0-9][0-9\-\s]{6,}[0-9]\b", "[phone]", text)
+    # Every email contains "@", so the substring check skips the costlier email regex
+    if "@" in text:
+        text = _EMAIL_RE.sub("[email]", text)
+    text = _PHONE_RE.sub("[phone]", text)
     return text
 
 
 def safe_clean_output(text: str, max_chars: int = 500) -> str:
     # Strip leading stub/debug prefixes (e.g., "[Gemini STUB] ... -> Example caption:") if present
-    text = re.sub(r"^\[[^\]]+\]\s*", "", text).strip()
-    text = re.sub(r"\s*->\s*Example caption:\s*", "", text, flags=re.IGNORECASE)
+    if text.startswith("["):
+        text = _STUB_PREFIX_RE.sub("", text, count=1)
+    text = text.strip()
+    if "->" in text:
+        text = _EXAMPLE_CAPTION_RE.sub("", text)
     text = scrub_pii(text)
     text = minimal_profanity_filter(text)
     text = truncate_text(text, max_chars=max_chars)
     return text
 
 
-def to_json(data: Dict[str, Any], pretty: bool = True) -> str:
+def to_json(data: Any, pretty: bool = True) -> str:
+    """Serialize a dict or dataclass (e.g. GeneratorResult) to JSON text."""
+    if orjson is not None:
+        # orjson serializes dataclasses natively, with no intermediate dict
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option).decode("utf-8")
+    if is_dataclass(data) and not isinstance(data, type):
+        data = asdict(data)
     if pretty:
         return json.dumps(data, ensure_ascii=False, indent=2)
     return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import json
+import threading
+import time
 from dataclasses import dataclass
 
-from src.generator import generate_posts
+from src.generator import STYLE_CUES, generate_posts, iter_posts
 from src.image_fetcher import ImageFetcher, ImageResult
 from src.llm_adapters import LLMAdapter
 
@@ -28,3 +31,143 @@ def test_generate_posts_basic():
     assert res.variants[0]["image_url"].startswith("http")
 
 
+@dataclass
+class ConcurrencyTrackingLLM(LLMAdapter):
+    def __post_init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def generate_text(self, prompt: str, max_tokens: int = 300, **kwargs) -> str:  # type: ignore[override]
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        return f"Fresh take: {prompt[-120:]}"
+
+
+def test_generate_posts_issues_variant_calls_concurrently():
+    llm = ConcurrencyTrackingLLM()
+    res = generate_posts("summer smoothie launch", variants=4, llm=llm, image_fetcher=DummyFetcher())
+    assert len(res.variants) == 4
+    assert len({v["text"] for v in res.variants}) == 4
+    assert llm.max_in_flight > 1
+
+
+def test_generate_posts_keeps_unique_captions_untagged():
+    res = generate_posts("summer smoothie launch", variants=3, llm=ConcurrencyTrackingLLM(), image_fetcher=DummyFetcher())
+    assert all(" · v" not in v["text"] for v in res.variants)
+
+
+def test_generate_posts_dedupes_identical_model_output():
+    res = generate_posts("coffee", variants=3, llm=DummyLLM(), image_fetcher=DummyFetcher())
+    texts = [v["text"] for v in res.variants]
+    assert texts[0] == "Buy now and save! #Deal #Coffee"
+    assert len(set(texts)) == 3
+
+
+@dataclass
+class GatedLLM(LLMAdapter):
+    """Holds back prompts using the second style cue until released."""
+
+    def __post_init__(self) -> None:
+        self.release = threading.Event()
+
+    def generate_text(self, prompt: str, max_tokens: int = 300, **kwargs) -> str:  # type: ignore[override]
+        if kwargs.get("json_mode"):
+            return "Plain text only, no JSON here."
+        if STYLE_CUES[1] in prompt:
+            self.release.wait(timeout=5)
+            return "Slow but steady savings! #Coffee"
+        return "Fast fresh deals! #Coffee"
+
+
+def test_iter_posts_yields_variants_as_they_complete():
+    llm = GatedLLM()
+    posts = iter_posts("coffee", variants=2, llm=llm, image_fetcher=DummyFetcher())
+    first = next(posts)
+    assert first["text"] == "Fast fresh deals! #Coffee"
+    llm.release.set()
+    second = next(posts)
+    assert second["text"] == "Slow but steady savings! #Coffee"
+    assert list(posts) == []
+
+
+@dataclass
+class BatchLLM(LLMAdapter):
+    batch_size: int = 3
+
+    def __post_init__(self) -> None:
+        self.calls = []
+
+    def generate_text(self, prompt: str, max_tokens: int = 300, **kwargs) -> str:  # type: ignore[override]
+        self.calls.append(bool(kwargs.get("json_mode")))
+        if kwargs.get("json_mode"):
+            variants = [{"text": f"Batched caption {i} #Coffee"} for i in range(self.batch_size)]
+            return "```json\n" + json.dumps({"variants": variants}) + "\n```"
+        return f"Single caption {len(self.calls)} #Coffee"
+
+
+def test_generate_posts_uses_single_batched_call():
+    llm = BatchLLM(batch_size=3)
+    res = generate_posts("coffee", variants=3, llm=llm, image_fetcher=DummyFetcher())
+    assert [v["text"] for v in res.variants] == [f"Batched caption {i} #Coffee" for i in range(3)]
+    assert llm.calls == [True]
+
+
+def test_generate_posts_fills_slots_missing_from_batch():
+    llm = BatchLLM(batch_size=1)
+    res = generate_posts("coffee", variants=3, llm=llm, image_fetcher=DummyFetcher())
+    texts = [v["text"] for v in res.variants]
+    assert texts[0] == "Batched caption 0 #Coffee"
+    assert len(set(texts)) == 3
+    assert llm.calls.count(True) == 1
+    # Two slots are missing, so up to four speculative prompts may run
+    assert 2 <= llm.calls.count(False) <= 4
+
+
+@dataclass
+class CollidingLLM(LLMAdapter):
+    """Returns the same caption for the first two style cues."""
+
+    def __post_init__(self) -> None:
+        self.prompts = []
+
+    def generate_text(self, prompt: str, max_tokens: int = 300, **kwargs) -> str:  # type: ignore[override]
+        self.prompts.append(prompt)
+        if kwargs.get("json_mode"):
+            return "no json"
+        if STYLE_CUES[0] in prompt or STYLE_CUES[1] in prompt:
+            return "Same old caption #Coffee"
+        return f"Distinct caption for {prompt[-60:]}"
+
+
+def test_generate_posts_oversamples_instead_of_retrying_serially():
+    llm = CollidingLLM()
+    res = generate_posts("coffee", variants=2, llm=llm, image_fetcher=DummyFetcher())
+    texts = [v["text"] for v in res.variants]
+    assert len(set(texts)) == 2
+    assert all(" · v" not in t and not t.endswith("#2") for t in texts)
+    # one batched prompt plus a single speculative round of max(2 + 2, 3) prompts
+    assert len(llm.prompts) <= 5
+
+
+@dataclass
+class CountingLLM(LLMAdapter):
+    def __post_init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def generate_text(self, prompt: str, max_tokens: int = 300, **kwargs) -> str:  # type: ignore[override]
+        with self.lock:
+            self.calls += 1
+        return "Only one caption needed #Coffee"
+
+
+def test_generate_posts_single_variant_makes_one_call():
+    llm = CountingLLM()
+    res = generate_posts("coffee", variants=1, llm=llm, image_fetcher=DummyFetcher())
+    assert [v["text"] for v in res.variants] == ["Only one caption needed #Coffee"]
+    assert llm.calls == 1
@@ -11,3 +11,55 @@ def test_suggestion_fetcher_returns_queries():
     assert all(r.url is None for r in results)
 
 
+def test_suggestion_fetcher_is_deterministic_and_leaves_global_random_alone():
+    import random
+
+    random.seed(1234)
+    expected_next = random.random()
+    random.seed(1234)
+
+    f = SuggestionFetcher()
+    first = f.search("espresso deal", limit=3, open_links=True)
+    second = f.search("espresso deal", limit=3, open_links=True)
+    assert first == second
+    assert len({r.query for r in first}) == 3
+    assert all(r.url and r.url.startswith("https://picsum.photos/seed/") for r in first)
+    assert random.random() == expected_next
+
+
+class FakeResponse:
+    def __init__(self, page: int, per_page: int) -> None:
+        self.payload = {"results": [{"urls": {"regular": f"https://img/{page}/{i}"}} for i in range(per_page)]}
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(params)
+        return FakeResponse(params["page"], params["per_page"])
+
+
+def test_unsplash_fetches_up_to_thirty_images_in_one_request(monkeypatch):
+    from src import image_fetcher
+
+    session = FakeSession()
+    monkeypatch.setenv("VIBEWRITER_CACHE_DISABLED", "1")
+    monkeypatch.setattr(image_fetcher, "_get_session", lambda: session)
+
+    results = image_fetcher.UnsplashFetcher("key").search("coffee", limit=10, open_links=True)
+    assert len(results) == 10
+    assert len({r.url for r in results}) == 10
+    assert [(c["page"], c["per_page"]) for c in session.calls] == [(1, 10)]
+
+    session.calls.clear()
+    results = image_fetcher.UnsplashFetcher("key").search("coffee", limit=35, open_links=True)
+    assert len(results) == 35
+    assert sorted((c["page"], c["per_page"]) for c in session.calls) == [(1, 30), (2, 30)]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sqlite3
+
+from src import llm_cache
+
+
+def _row_count(directory) -> int:
+    conn = sqlite3.connect(directory / "responses.sqlite3")
+    try:
+        return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_cache_roundtrip_and_expiry(tmp_path, monkeypatch):
+    monkeypatch.setenv("VIBEWRITER_CACHE_DIR", str(tmp_path))
+    key = llm_cache.make_key(provider="google", model="gemini-2.0-flash", prompt="hello", max_tokens=140)
+    assert llm_cache.get(key) is None
+    llm_cache.put(key, "Cached caption #Deal")
+    assert llm_cache.get(key) == "Cached caption #Deal"
+    llm_cache.put(key, "stale", expire=-1)
+    assert llm_cache.get(key) is None
+    assert _row_count(tmp_path) == 0
+
+    # put() also purges other expired rows
+    llm_cache.put("old", "stale", expire=-1)
+    llm_cache.put("fresh", "value")
+    assert _row_count(tmp_path) == 1
+
+
+def test_cache_key_depends_on_all_parts():
+    a = llm_cache.make_key(provider="openai", model="gpt-4o-mini", prompt="p", max_tokens=140)
+    b = llm_cache.make_key(provider="openai", model="gpt-4o-mini", prompt="p", max_tokens=120)
+    assert a != b
+    assert a == llm_cache.make_key(max_tokens=140, prompt="p", model="gpt-4o-mini", provider="openai")
+
+
+def test_cache_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("VIBEWRITER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("VIBEWRITER_CACHE_DISABLED", "1")
+    llm_cache.put("k", "v")
+    assert llm_cache.get("k") is None
+
+
+def test_cache_closes_connection_when_table_setup_fails(tmp_path, monkeypatch):
+    closed = []
+
+    class FailingConnection:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, *args):
+            raise sqlite3.OperationalError("database is locked")
+
+        def close(self):
+            closed.append(True)
+
+    monkeypatch.setenv("VIBEWRITER_CACHE_DIR", str(tmp_path / "locked"))
+    monkeypatch.setattr(llm_cache.sqlite3, "connect", lambda *a, **k: FailingConnection())
+    assert llm_cache.get("k") is None
+    assert closed == [True]
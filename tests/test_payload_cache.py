@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from src.streamlit_ui.payload_cache import PayloadCache
+
+
+def test_payload_cache_roundtrip_and_expiry():
+    cache = PayloadCache(ttl=3600)
+    key = ("coffee", 3, "google", "gemini-2.0-flash", "suggest", "digest")
+    assert cache.get(key) is None
+    payload = {"topic": "coffee", "variants": [{"text": "Sip!", "image_query": "cup", "image_url": None}]}
+    cache.put(key, payload)
+    assert cache.get(key) == payload
+
+    expired = PayloadCache(ttl=-1)
+    expired.put(key, payload)
+    assert expired.get(key) is None
+
+
+def test_payload_cache_evicts_oldest_entry_when_full():
+    cache = PayloadCache(ttl=3600, max_entries=2)
+    cache.put("a", {"topic": "a"})
+    cache.put("b", {"topic": "b"})
+    cache.put("c", {"topic": "c"})
+    assert cache.get("a") is None
+    assert cache.get("b") == {"topic": "b"}
+    assert cache.get("c") == {"topic": "c"}
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+
+from src.utils import minimal_profanity_filter, safe_clean_output, scrub_pii, to_json
+
+
+def test_profanity_filter_masks_whole_words_only():
+    assert minimal_profanity_filter("Damn good coffee") == "D**n good coffee"
+    assert minimal_profanity_filter("damnation is a word") == "damnation is a word"
+
+
+def test_scrub_pii_replaces_email_and_phone():
+    out = scrub_pii("Mail hi@example.com or call +1 555 123 4567")
+    assert out == "Mail [email] or call +[phone]"
+
+
+def test_safe_clean_output_strips_stub_prefix_and_truncates():
+    out = safe_clean_output("[Gemini STUB] prompt -> Example caption: Sip and save! #Coffee", max_chars=500)
+    assert out == "promptSip and save! #Coffee"
+    assert safe_clean_output("x" * 50, max_chars=10) == "x" * 9 + "…"
+
+
+def test_profanity_filter_returns_clean_text_unchanged():
+    text = "Sip and save this weekend! #Coffee"
+    assert minimal_profanity_filter(text) is text
+    assert minimal_profanity_filter("SHIT happens") == "S**T happens"
+
+
+def test_to_json_matches_stdlib_layout():
+    payload = {"topic": "café ☕", "variants": [{"text": "Sip!", "image_url": None}], "empty": []}
+    assert to_json(payload, pretty=True) == json.dumps(payload, ensure_ascii=False, indent=2)
+    assert to_json(payload, pretty=False) == json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def test_to_json_serializes_dataclasses_directly(monkeypatch):
+    from src import utils
+    from src.generator import GeneratorResult
+
+    result = GeneratorResult(topic="coffee", variants=[{"text": "Sip!", "image_query": "cup", "image_url": None}])
+    expected = to_json({"topic": "coffee", "variants": result.variants})
+    assert to_json(result) == expected
+    monkeypatch.setattr(utils, "orjson", None)
+    assert to_json(result) == expected
+
+
+def test_safe_clean_output_fast_paths_keep_scrubbing_late_pii():
+    clean = "Fresh brews, cozy vibes. Stop by today! #Coffee #Local"
+    assert safe_clean_output(clean) == clean
+    late = "A long and perfectly friendly caption that rambles on for quite a while, then says call 555-123-4567"
+    assert safe_clean_output(late).endswith("call [phone]")